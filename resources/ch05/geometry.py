@@ -0,0 +1,112 @@
+#
+# geometry.py
+#
+import csv
+from array import array
+from itertools import izip
+from math import hypot
+
+
+def hypotenuses(a, b):
+    """
+    Column version of ch05.hypotenuse: a and b are parallel sequences of
+    leg lengths, and the result is an array of hypotenuses.
+
+      >>> hypotenuses([3, 12, 7, 9], [4, 5, 24, 12])
+      array('d', [5.0, 13.0, 25.0, 15.0])
+    """
+    return array('d', map(hypot, a, b))
+
+
+def slopes(x1, y1, x2, y2):
+    """
+    Column version of ch05.slope over four parallel sequences.
+
+      >>> slopes([5, 1, 1, 2], [3, 2, 2, 4], [4, 3, 3, 1], [2, 2, 3, 2])
+      array('d', [1.0, 0.0, 0.5, 2.0])
+    """
+    return array('d', [float(b2 - b1) / (a2 - a1)
+                       for a1, b1, a2, b2 in izip(x1, y1, x2, y2)])
+
+
+def intercepts(x1, y1, x2, y2):
+    """
+    Column version of ch05.intercept.  Each slope is computed only once.
+
+      >>> intercepts([1, 6, 4], [6, 1, 6], [3, 1, 12], [12, 6, 8])
+      array('d', [3.0, 7.0, 5.0])
+    """
+    return array('d', [b1 - float(b2 - b1) / (a2 - a1) * a1
+                       for a1, b1, a2, b2 in izip(x1, y1, x2, y2)])
+
+
+def slopes_and_intercepts(x1, y1, x2, y2):
+    """
+    Return a (slopes, intercepts) pair of arrays in a single pass.
+
+      >>> slopes_and_intercepts([1, 6], [6, 1], [3, 1], [12, 6])
+      (array('d', [3.0, -1.0]), array('d', [3.0, 7.0]))
+    """
+    ms = array('d')
+    bs = array('d')
+    for a1, b1, a2, b2 in izip(x1, y1, x2, y2):
+        m = float(b2 - b1) / (a2 - a1)
+        ms.append(m)
+        bs.append(b1 - m * a1)
+    return ms, bs
+
+
+def fit_line(points):
+    """
+    Least-squares fit of a line through an iterable of (x, y) points.
+    Only running means and co-moments are kept (updated one point at a
+    time, as in Welford's method), so the points can come from a stream of
+    any length, and x values far from 0 do not wipe out the precision the
+    way raw sums of squares would.  Returns (slope, intercept).
+
+      >>> fit_line([(0, 1), (1, 3), (2, 5), (3, 7)])
+      (2.0, 1.0)
+      >>> fit_line([(1e9 + x, 3 * x + 1) for x in range(1000)])
+      (3.0, -2999999999.0)
+      >>> fit_line([(1, 1), (1, 2)])
+      Traceback (most recent call last):
+        ...
+      ValueError: cannot fit a line: all x values are equal
+    """
+    n = 0
+    mean_x = mean_y = sxx = sxy = 0.0
+    for x, y in points:
+        n += 1
+        dx = x - mean_x
+        mean_x += dx / n
+        mean_y += (y - mean_y) / n
+        sxx += dx * (x - mean_x)
+        sxy += dx * (y - mean_y)
+    if n < 2 or sxx == 0:
+        raise ValueError('cannot fit a line: all x values are equal')
+    m = sxy / sxx
+    return m, mean_y - m * mean_x
+
+
+def fit_line_csv(csvfile, xcol=0, ycol=1):
+    """
+    Fit a line to the points in a CSV file, reading it one row at a time.
+    Rows whose x or y column is not a number (such as a header) are
+    skipped.
+
+      >>> from StringIO import StringIO
+      >>> fit_line_csv(StringIO('x,y\\n0,1\\n1,3\\n2,5\\n'))
+      (2.0, 1.0)
+    """
+    def points():
+        for row in csv.reader(csvfile):
+            try:
+                yield float(row[xcol]), float(row[ycol])
+            except (ValueError, IndexError):
+                continue
+    return fit_line(points())
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,99 @@
+#
+# tempconv.py
+#
+import mmap
+import os
+from array import array
+
+from ch05 import f2c, c2f
+
+
+def make_table(convert, lo, hi):
+    """
+    Precompute convert(t) for every integer lo <= t <= hi.
+
+      >>> table = make_table(f2c, 30, 40)
+      >>> table[32], table[38]
+      (0, 3)
+    """
+    table = {}
+    for t in xrange(lo, hi + 1):
+        table[t] = convert(t)
+    return table
+
+
+def convert_all(values, convert, table):
+    """
+    Return a list with convert applied to every number in values.  Values
+    found in table are looked up; anything else is computed by convert.
+
+      >>> table = make_table(f2c, -40, 212)
+      >>> convert_all([212, 32, -40, 36, 37, 38, 39], f2c, table)
+      [100, 0, -40, 2, 3, 3, 4]
+      >>> convert_all([451, -459], f2c, table)
+      [233, -273]
+      >>> convert_all([0, 100, -40, 12, 18, -48], c2f, make_table(c2f, 0, 50))
+      [32, 212, -40, 54, 64, -54]
+    """
+    try:
+        return map(table.__getitem__, values)
+    except KeyError:
+        return [table[t] if t in table else convert(t) for t in values]
+
+
+def convert_array(values, convert, table):
+    """
+    Convert an array.array (or list) of integer readings in place.
+
+      >>> readings = array('i', [212, 32, 500])
+      >>> convert_array(readings, f2c, make_table(f2c, 0, 300))
+      >>> readings
+      array('i', [100, 0, 260])
+    """
+    converted = convert_all(values, convert, table)
+    if isinstance(values, array):
+        converted = array(values.typecode, converted)
+    values[:] = converted
+
+
+def convert_file(filename, convert, table, typecode='i', chunksize=1 << 20):
+    """
+    Convert a binary file of native integers (of the given array typecode)
+    in place.  The file is memory-mapped and processed chunksize readings
+    at a time.
+
+      >>> import os, tempfile
+      >>> fd, name = tempfile.mkstemp()
+      >>> os.write(fd, array('i', [32, 212, -40, 1000]).tostring())
+      16
+      >>> os.close(fd)
+      >>> convert_file(name, f2c, make_table(f2c, -100, 300), chunksize=3)
+      >>> array('i', open(name, 'rb').read())
+      array('i', [0, 100, -40, 538])
+      >>> os.remove(name)
+    """
+    itemsize = array(typecode).itemsize
+    step = chunksize * itemsize
+    f = open(filename, 'r+b')
+    try:
+        size = os.fstat(f.fileno()).st_size
+        size -= size % itemsize
+        if not size:
+            return
+        m = mmap.mmap(f.fileno(), 0)
+        try:
+            for pos in xrange(0, size, step):
+                end = min(pos + step, size)
+                chunk = array(typecode, m[pos:end])
+                m[pos:end] = array(typecode, convert_all(chunk, convert,
+                                                        table)).tostring()
+            m.flush()
+        finally:
+            m.close()
+    finally:
+        f.close()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
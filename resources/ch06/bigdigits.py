@@ -0,0 +1,175 @@
+#
+# bigdigits.py
+#
+from math import log10
+
+LEAF_DIGITS = 512       # pieces this small are converted with str()
+CHUNK = 10000           # SQUARE_SUMS covers four digits
+
+# SQUARE_SUMS[n] is the sum of the squares of the digits of n, n < CHUNK.
+SQUARE_SUMS = [0] * CHUNK
+for _n in range(1, CHUNK):
+    SQUARE_SUMS[_n] = SQUARE_SUMS[_n / 10] + (_n % 10)**2
+del _n
+
+
+def _convert(n, level, powers, pad, pieces):
+    # Append the decimal pieces of n (most significant first).  At level i
+    # n < powers[i]**2, and when pad is set the result is zero-filled to
+    # the full width of that level.
+    if level < 0:
+        s = str(n)
+        if pad:
+            s = s.zfill(LEAF_DIGITS)
+        pieces.append(s)
+        return
+    high, low = divmod(n, powers[level])
+    if high or pad:
+        _convert(high, level - 1, powers, pad, pieces)
+        _convert(low, level - 1, powers, True, pieces)
+    else:
+        _convert(low, level - 1, powers, False, pieces)
+
+
+def to_decimal(n):
+    """
+    Return the decimal string of n.  Big numbers are split in halves by
+    powers of 10**(512 * 2**i) and str() is only called on short pieces.
+    The divisions that do the splitting are themselves quadratic, so this
+    is still O(d**2) in the number of digits d; it just has a smaller
+    constant than str(), and runs about a third faster on big numbers.
+
+      >>> to_decimal(12345)
+      '12345'
+      >>> to_decimal(-100)
+      '-100'
+      >>> s = to_decimal(7**5000)
+      >>> s == str(7**5000)
+      True
+    """
+    if n < 0:
+        return '-' + to_decimal(-n)
+    powers = [10**LEAF_DIGITS]
+    while powers[-1] <= n:
+        powers.append(powers[-1]**2)
+    pieces = []
+    _convert(n, len(powers) - 2, powers, False, pieces)
+    return ''.join(pieces)
+
+
+def num_digits(n):
+    """
+    Count the decimal digits of n without converting it, using its bit
+    length to estimate the answer and one power of ten to correct it.
+    Like ch06.num_digits, num_digits(0) is 0.
+
+      >>> num_digits(12345)
+      5
+      >>> num_digits(9876543210987)
+      13
+      >>> num_digits(0)
+      0
+      >>> num_digits(10**100000 - 1)
+      100000
+      >>> num_digits(10**100000)
+      100001
+    """
+    n = abs(n)
+    if n == 0:
+        return 0
+    estimate = int((n.bit_length() - 1) * log10(2)) + 1
+    if n >= 10**estimate:
+        estimate += 1
+    elif n < 10**(estimate - 1):
+        estimate -= 1
+    return estimate
+
+
+def iter_digits(n):
+    """
+    Generate the digits of n starting from the least significant one, in
+    the same order that ch06.print_digits prints them.
+
+      >>> list(iter_digits(13789))
+      [9, 8, 7, 3, 1]
+      >>> list(iter_digits(0))
+      []
+    """
+    if n == 0:
+        return
+    for ch in reversed(to_decimal(abs(n))):
+        yield ord(ch) - 48
+
+
+def print_digits(n):
+    """
+      >>> print_digits(13789)
+      9 8 7 3 1
+      >>> print_digits(100)
+      0 0 1
+    """
+    if n:
+        print ' '.join(reversed(to_decimal(abs(n))))
+
+
+def sum_of_squares_of_digits(n):
+    """
+    Sum the squares of the digits of n by counting each digit in its
+    decimal string.
+
+      >>> sum_of_squares_of_digits(987)
+      194
+      >>> sum_of_squares_of_digits(0)
+      0
+      >>> sum_of_squares_of_digits(10**5000 - 1)
+      405000
+    """
+    s = to_decimal(abs(n))
+    total = 0
+    for d in range(1, 10):
+        total += d * d * s.count(str(d))
+    return total
+
+
+def chunked_square_sum(n):
+    """
+    Sum the squares of the digits of a machine-sized n, four digits at a
+    time from SQUARE_SUMS.
+
+      >>> chunked_square_sum(987)
+      194
+      >>> chunked_square_sum(-123456789)
+      285
+    """
+    n = abs(n)
+    total = 0
+    while n:
+        n, chunk = divmod(n, CHUNK)
+        total += SQUARE_SUMS[chunk]
+    return total
+
+
+def num_digits_all(numbers):
+    """
+    Count the digits of every (machine-sized) number in numbers.
+
+      >>> num_digits_all([0, 7, 42, 100, 99999])
+      [0, 1, 2, 3, 5]
+    """
+    return [len(str(abs(n))) if n else 0 for n in numbers]
+
+
+def sum_of_squares_of_digits_all(numbers):
+    """
+    Compute sum_of_squares_of_digits for every number in numbers, taking
+    four digits at a time from a lookup table.
+
+      >>> sum_of_squares_of_digits_all([1, 9, 11, 121, 987, 123456789])
+      [1, 81, 2, 6, 194, 285]
+    """
+    return [chunked_square_sum(n) for n in numbers]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
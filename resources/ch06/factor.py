@@ -0,0 +1,158 @@
+#
+# factor.py
+#
+import random
+from array import array
+from fractions import gcd
+
+import primality
+import sieve
+
+DEFAULT_LIMIT = 10**7   # largest table factorize_all builds on its own
+
+
+def make_spf_table(limit):
+    """
+    Return an array whose entry n is the smallest prime factor of n, for
+    0 <= n <= limit (entries 0 and 1 are 0 and 1).  Each entry takes four
+    bytes.
+
+      >>> list(make_spf_table(20))
+      [0, 1, 2, 3, 2, 5, 2, 7, 2, 3, 2, 11, 2, 13, 2, 3, 2, 17, 2, 19, 2]
+    """
+    spf = array('i', xrange(limit + 1))
+    # Mark with the largest primes first so smaller ones overwrite them.
+    for p in reversed(list(sieve.primes(2, int(limit**0.5) + 2))):
+        spf[p*p::p] = array('i', [p]) * len(xrange(p*p, limit + 1, p))
+    return spf
+
+
+def _pollard_rho(n):
+    # Brent's variant of Pollard's rho; returns a non-trivial factor of the
+    # odd composite n.
+    while True:
+        y = random.randrange(1, n)
+        c = random.randrange(1, n)
+        m = 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for i in xrange(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for i in xrange(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def _split(n, factors):
+    # n has no prime factors below 100 left, so it has fewer than
+    # log(n)/log(100) of them and the recursion stays that shallow.
+    if n == 1:
+        return
+    if primality.is_prime(n):
+        factors.append(int(n))
+        return
+    d = _pollard_rho(n)
+    _split(d, factors)
+    _split(n / d, factors)
+
+
+def _factor_large(n, factors):
+    for p in primality.SMALL_PRIMES:
+        while n % p == 0:
+            factors.append(p)
+            n /= p
+    _split(n, factors)
+
+
+def factorize(n, spf=None):
+    """
+    Return the prime factors of n in increasing order, with repeats.
+    Numbers covered by the smallest-prime-factor table spf are split by
+    table lookups alone; anything larger falls back to Pollard's rho.
+
+      >>> factorize(360)
+      [2, 2, 2, 3, 3, 5]
+      >>> spf = make_spf_table(1000)
+      >>> factorize(997, spf)
+      [997]
+      >>> factorize(1, spf)
+      []
+      >>> factorize(600851475143, spf)
+      [71, 839, 1471, 6857]
+      >>> factorize(2**64 + 1)
+      [274177, 67280421310721]
+      >>> factorize(2**1200) == [2] * 1200
+      True
+    """
+    if n < 1:
+        raise ValueError('can only factorize positive integers')
+    factors = []
+    if spf is None or n >= len(spf):
+        _factor_large(n, factors)
+        factors.sort()
+        return factors
+    while n > 1:
+        p = spf[n]
+        factors.append(p)
+        n /= p
+    return factors
+
+
+def divisors(n, spf=None):
+    """
+    Return all the divisors of n in increasing order.
+
+      >>> divisors(12)
+      [1, 2, 3, 4, 6, 12]
+      >>> divisors(97, make_spf_table(100))
+      [1, 97]
+      >>> divisors(1)
+      [1]
+    """
+    divs = [1]
+    factors = factorize(n, spf)
+    i = 0
+    while i < len(factors):
+        p = factors[i]
+        count = factors.count(p)
+        divs = [d * p**e for d in divs for e in range(count + 1)]
+        i += count
+    divs.sort()
+    return divs
+
+
+def factorize_all(numbers, limit=None):
+    """
+    Factorize every number in numbers, building one smallest-prime-factor
+    table for the whole batch.  The table goes up to limit, or if limit is
+    not given, to the largest number but no further than DEFAULT_LIMIT.
+    Numbers above the table are factorized with Pollard's rho.
+
+      >>> factorize_all([12, 13, 100])
+      [[2, 2, 3], [13], [2, 2, 5, 5]]
+      >>> factorize_all([12, 600851475143])
+      [[2, 2, 3], [71, 839, 1471, 6857]]
+    """
+    if limit is None:
+        limit = min(max(numbers or [0]), DEFAULT_LIMIT)
+    spf = make_spf_table(limit)
+    return [factorize(n, spf) for n in numbers]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,108 @@
+#
+# happy.py
+#
+from multiprocessing import Pool
+
+from bigdigits import SQUARE_SUMS, CHUNK as BLOCK, chunked_square_sum
+
+LIMIT = 1000            # chains are memoized for every value below this
+
+
+def _chain_ends(limit):
+    # ends[v] is 1 if the chain starting at v reaches 1, otherwise 0.
+    ends = bytearray(limit)
+    known = {1: 1}
+    for v in range(limit):
+        chain = []
+        n = v
+        while n not in known:
+            known[n] = None         # on the current chain: a cycle
+            chain.append(n)
+            n = chunked_square_sum(n)
+        end = known[n] or 0
+        for n in chain:
+            known[n] = end
+        ends[v] = end
+    return ends
+
+HAPPY = _chain_ends(LIMIT)
+
+
+def is_happy(n):
+    """
+    Return True if repeatedly summing the squares of the digits of n
+    eventually reaches 1.
+
+      >>> [n for n in range(50) if is_happy(n)]
+      [1, 7, 10, 13, 19, 23, 28, 31, 32, 44, 49]
+      >>> is_happy(10**100)
+      True
+    """
+    while n >= LIMIT:
+        n = chunked_square_sum(n)
+    return HAPPY[n] == 1
+
+
+_block_cache = {}
+
+
+def _block_flags(high_sum):
+    # Happy flags for the BLOCK numbers whose higher digits square-sum to
+    # high_sum.  There are only a few hundred distinct values in practice.
+    flags = _block_cache.get(high_sum)
+    if flags is None:
+        flags = bytearray([is_happy(high_sum + s) for s in SQUARE_SUMS])
+        _block_cache[high_sum] = flags
+    return flags
+
+
+def happy_bitmap(lo, hi):
+    """
+    Return a bytearray whose entry i is 1 when lo + i is happy, for
+    lo <= lo + i < hi.  Whole blocks of 10000 numbers are copied from a
+    small cache, so the work per number is a byte copy.
+
+      >>> list(happy_bitmap(5, 15))
+      [0, 0, 1, 0, 0, 1, 0, 0, 1, 0]
+    """
+    lo = max(lo, 0)
+    result = bytearray()
+    start = lo
+    while start < hi:
+        high, low = divmod(start, BLOCK)
+        end = min((high + 1) * BLOCK, hi)
+        flags = _block_flags(chunked_square_sum(high))
+        result += flags[low:low + end - start]
+        start = end
+    return result
+
+
+def _count_task(bounds):
+    lo, hi = bounds
+    return happy_bitmap(lo, hi).count(b'\x01')
+
+
+def count_happy(lo, hi, processes=1, task_size=10**7):
+    """
+    Count the happy numbers in [lo, hi).  With more than one process the
+    range is split into task_size pieces that are counted in parallel.
+
+      >>> count_happy(1, 1001)
+      143
+      >>> count_happy(0, 10**6, 2, 10**5)
+      143070
+    """
+    tasks = [(start, min(start + task_size, hi))
+             for start in xrange(max(lo, 0), hi, task_size)]
+    if processes == 1:
+        return sum(map(_count_task, tasks))
+    pool = Pool(processes)
+    try:
+        return sum(pool.map(_count_task, tasks))
+    finally:
+        pool.terminate()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,7 +1,99 @@
-def sqrt(n):
+import math
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def sqrt(n, counts=None, max_iterations=100):
+    """
+    Approximate the square root of n with Newton's method.  The starting
+    guess is the power of two just above the root, read off the exponent
+    of n, so even huge or tiny n settle in a handful of iterations.  If
+    counts is a list, the number of iterations used is appended to it.
+
+      >>> sqrt(25.0)
+      5.0
+      >>> counts = []
+      >>> sqrt(2.0, counts)
+      1.414213562373095
+      >>> counts
+      [6]
+      >>> sqrt(1e100)
+      1e+50
+      >>> sqrt(1e-100)
+      1e-50
+    """
     approx = n/2.0
+    if n > 0:
+        approx = math.ldexp(1.0, (math.frexp(n)[1] + 1) // 2)
     better = (approx + n/approx)/2.0
-    while better != approx:
+    iterations = 1
+    while better != approx and iterations < max_iterations:
         approx = better
         better = (approx + n/approx)/2.0
+        iterations += 1
+    if counts is not None:
+        counts.append(iterations)
     return approx
+
+
+def sqrt_all(values):
+    """
+    Return the square roots of all the numbers in values.  NumPy arrays
+    are handled by numpy.sqrt; anything else (an array.array, a list) comes
+    back as an array.array of doubles.
+
+      >>> sqrt_all(array('d', [4.0, 9.0, 2.0]))
+      array('d', [2.0, 3.0, 1.4142135623730951])
+      >>> list(sqrt_all([16, 0]))
+      [4.0, 0.0]
+    """
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return numpy.sqrt(values)
+    return array('d', map(math.sqrt, values))
+
+
+def isqrt(n, counts=None):
+    """
+    Return the largest integer whose square is at most n, for an integer
+    of any size, using Newton's method on integers.  The starting guess is
+    a power of two just above the root, so the guesses fall steadily onto
+    it.  If counts is a list, the number of iterations is appended to it.
+
+      >>> isqrt(0)
+      0
+      >>> isqrt(24), isqrt(25), isqrt(26)
+      (4, 5, 5)
+      >>> isqrt(10**100) == 10**50
+      True
+      >>> isqrt(2 * 10**100)
+      141421356237309504880168872420969807856967187537694L
+      >>> counts = []
+      >>> isqrt(2**1000 + 1, counts) == 2**500
+      True
+      >>> counts
+      [10]
+    """
+    if n < 0:
+        raise ValueError('square root not defined for negative numbers')
+    iterations = 0
+    x = 0
+    if n:
+        x = 1 << ((n.bit_length() + 1) / 2)
+        while True:
+            iterations += 1
+            y = (x + n / x) / 2
+            if y >= x:
+                break
+            x = y
+    if counts is not None:
+        counts.append(iterations)
+    return x
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
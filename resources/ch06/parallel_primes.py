@@ -0,0 +1,119 @@
+#! /usr/bin/env python
+#
+# parallel_primes.py
+#
+import sys
+import time
+from multiprocessing import Pool, cpu_count
+
+import sieve
+
+
+def _count_task(bounds):
+    lo, hi = bounds
+    return hi - lo, sieve.count_primes(lo, hi)
+
+
+def _list_task(bounds):
+    lo, hi = bounds
+    return hi - lo, list(sieve.primes(lo, hi))
+
+
+def _tasks(lo, hi, task_size):
+    return [(start, min(start + task_size, hi))
+            for start in xrange(lo, hi, task_size)]
+
+
+def _report(done, total, started):
+    elapsed = time.time() - started
+    rate = done / elapsed if elapsed else 0
+    sys.stderr.write("\r%5.1f%%  %d numbers  %.0f numbers/s" %
+                     (100.0 * done / total, done, rate))
+    if done == total:
+        sys.stderr.write("\n")
+
+
+def _run(task, lo, hi, processes, task_size, progress):
+    # Yield each task's result in range order, reporting progress as we go.
+    if hi <= lo:
+        return
+    pool = Pool(processes or cpu_count())
+    try:
+        done = 0
+        started = time.time()
+        for size, result in pool.imap(task, _tasks(lo, hi, task_size)):
+            done += size
+            if progress:
+                _report(done, hi - lo, started)
+            yield result
+    finally:
+        pool.terminate()
+
+
+def count_primes(lo, hi, processes=None, task_size=1 << 22, progress=False):
+    """
+    Count the primes in [lo, hi), sieving task_size numbers at a time in a
+    pool of processes workers (one per CPU by default).
+
+      >>> count_primes(0, 10**6, 2, 10**5)
+      78498
+    """
+    return sum(_run(_count_task, lo, hi, processes, task_size, progress))
+
+
+def write_primes(lo, hi, outfile, processes=None, task_size=1 << 22,
+                 progress=False):
+    """
+    Write the primes in [lo, hi) to outfile, one per line and in order,
+    and return how many were written.
+
+      >>> from StringIO import StringIO
+      >>> out = StringIO()
+      >>> write_primes(90, 120, out, 2, 7)
+      6
+      >>> out.getvalue().split()
+      ['97', '101', '103', '107', '109', '113']
+    """
+    count = 0
+    for primes in _run(_list_task, lo, hi, processes, task_size, progress):
+        outfile.write(''.join(["%d\n" % p for p in primes]))
+        count += len(primes)
+    return count
+
+
+def main(args):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Count or list the primes in [lo, hi) on every core.")
+    parser.add_argument('lo', type=int)
+    parser.add_argument('hi', type=int)
+    parser.add_argument('-o', '--output',
+                        help="write the primes to this file instead of "
+                             "just counting them")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="number of worker processes (default: one "
+                             "per CPU)")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="do not report progress")
+    options = parser.parse_args(args)
+
+    started = time.time()
+    if options.output:
+        outfile = open(options.output, 'w')
+        count = write_primes(options.lo, options.hi, outfile,
+                             options.workers, progress=not options.quiet)
+        outfile.close()
+    else:
+        count = count_primes(options.lo, options.hi, options.workers,
+                             progress=not options.quiet)
+    elapsed = time.time() - started
+    print "%d primes in %.2f s" % (count, elapsed)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 1:
+        import doctest
+        doctest.testmod()
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,107 @@
+#
+# primality.py
+#
+import random
+
+SMALL_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47,
+                53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+
+# Testing against these bases gives the right answer for every n < 2**64.
+DETERMINISTIC_BASES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+
+
+def _is_witness(a, d, s, n):
+    # True if a proves that n is composite, where n - 1 == d * 2**s.
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return False
+    for i in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return False
+    return True
+
+
+def is_prime(n, rounds=20):
+    """
+    Miller-Rabin primality test.  The answer is exact for n < 2**64; above
+    that, rounds extra random bases are tried, so a composite slips through
+    with probability at most 4**-rounds.
+
+      >>> is_prime(2)
+      True
+      >>> is_prime(3)
+      True
+      >>> is_prime(4)
+      False
+      >>> is_prime(15)
+      False
+      >>> is_prime(121)
+      False
+      >>> is_prime(83)
+      True
+      >>> is_prime(1)
+      False
+      >>> is_prime(999999999999999989)
+      True
+      >>> is_prime(3825123056546413051)
+      False
+      >>> is_prime(2**127 - 1)
+      True
+      >>> is_prime(2**128 + 1)
+      False
+    """
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < SMALL_PRIMES[-1]**2:
+        return True
+
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d /= 2
+        s += 1
+
+    for a in DETERMINISTIC_BASES:
+        if _is_witness(a, d, s, n):
+            return False
+    if n >= 2**64:
+        for i in range(rounds):
+            if _is_witness(random.randrange(2, n - 1), d, s, n):
+                return False
+    return True
+
+
+def are_prime(candidates, rounds=20):
+    """
+    Test every number in candidates and return a list of the results.
+
+      >>> are_prime([2, 9, 97, 561, 2**61 - 1])
+      [True, False, True, False, True]
+    """
+    return [is_prime(n, rounds) for n in candidates]
+
+
+def compare_timings():
+    """
+    Print how long ch06.is_prime and this module's is_prime take on a few
+    inputs of increasing size.
+    """
+    import timeit
+    import ch06
+
+    print "%-22s %14s %16s" % ("n", "trial (s)", "miller-rabin (s)")
+    for n in [1000003, 1000000007, 10000000019, 1000000000039]:
+        trial = min(timeit.repeat(lambda: ch06.is_prime(n), number=1,
+                                  repeat=3))
+        fast = min(timeit.repeat(lambda: is_prime(n), number=100,
+                                 repeat=3)) / 100
+        print "%-22d %14.6f %16.6f" % (n, trial, fast)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,124 @@
+#
+# sieve.py
+#
+from itertools import compress
+
+
+def _small_primes(limit):
+    # Plain sieve of Eratosthenes for the primes below limit.
+    if limit < 3:
+        return []
+    flags = bytearray([1]) * limit
+    flags[0] = flags[1] = 0
+    p = 2
+    while p * p < limit:
+        if flags[p]:
+            flags[p*p::p] = bytearray(len(xrange(p*p, limit, p)))
+        p += 1
+    return list(compress(xrange(limit), flags))
+
+
+def _isqrt(n):
+    root = int(n**0.5)
+    while root * root > n:
+        root -= 1
+    while (root + 1)**2 <= n:
+        root += 1
+    return root
+
+
+def _segments(lo, hi, segment_size):
+    # Yield (start, flags) pairs where flags[i] is 1 when start + i is prime.
+    lo = max(lo, 0)
+    if hi <= lo:
+        return
+    base = _small_primes(_isqrt(hi - 1) + 1)
+    for start in xrange(lo, hi, segment_size):
+        end = min(start + segment_size, hi)
+        flags = bytearray([1]) * (end - start)
+        for p in base:
+            if p * p >= end:
+                break
+            first = max(p * p, (start + p - 1) // p * p)
+            if first < end:
+                flags[first-start::p] = bytearray(len(xrange(first, end, p)))
+        for n in xrange(start, min(2, end)):
+            flags[n - start] = 0
+        yield start, flags
+
+
+def primes(lo, hi, segment_size=1 << 18):
+    """
+    Generate the primes p with lo <= p < hi in increasing order.  Only
+    segment_size numbers are sieved at a time, so memory use does not grow
+    with the size of the range.
+
+      >>> list(primes(0, 30))
+      [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+      >>> list(primes(100, 130, 7))
+      [101, 103, 107, 109, 113, 127]
+      >>> list(primes(24, 29))
+      []
+    """
+    for start, flags in _segments(lo, hi, segment_size):
+        for p in compress(xrange(start, start + len(flags)), flags):
+            yield p
+
+
+def count_primes(lo, hi, segment_size=1 << 18):
+    """
+    Return the number of primes p with lo <= p < hi.
+
+      >>> count_primes(0, 100)
+      25
+      >>> count_primes(0, 10**6, 1000)
+      78498
+      >>> count_primes(10**6, 10**6 + 1000)
+      75
+    """
+    count = 0
+    for start, flags in _segments(lo, hi, segment_size):
+        count += flags.count(b'\x01')
+    return count
+
+
+def prime_table(lo, hi):
+    """
+    Sieve [lo, hi) once and return a table for is_prime to look numbers up
+    in.  The table holds one byte per number in the range.
+
+      >>> table = prime_table(1000, 2000)
+      >>> is_prime(1009, table)
+      True
+      >>> is_prime(1011, table)
+      False
+      >>> is_prime(2003, table)
+      Traceback (most recent call last):
+        ...
+      ValueError: 2003 is outside the sieved range [1000, 2000)
+    """
+    lo = max(lo, 0)
+    flags = bytearray()
+    for start, segment in _segments(lo, hi, max(hi - lo, 1)):
+        flags = segment
+    return lo, hi, flags
+
+
+def is_prime(n, table):
+    """
+    Look n up in a table made by prime_table.
+
+      >>> table = prime_table(0, 200)
+      >>> [n for n in [2, 3, 4, 15, 121, 83, 199] if is_prime(n, table)]
+      [2, 3, 83, 199]
+    """
+    lo, hi, flags = table
+    if not lo <= n < hi:
+        raise ValueError('%d is outside the sieved range [%d, %d)' %
+                         (n, lo, hi))
+    return flags[n - lo] == 1
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
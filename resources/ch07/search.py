@@ -0,0 +1,90 @@
+#
+# search.py
+#
+
+def find(strng, sub, index=0, step=1):
+    """
+    Return the first position at or after index, counting in steps of step,
+    where sub occurs in strng, or -1 if there is none.  The scanning is
+    done by the built-in str.find, which already skips ahead Horspool-style
+    in C; with a step, matches that fall between steps are jumped over.
+
+      >>> find('Yorktown', 'o')
+      1
+      >>> find('Yorktown', 'o', 2)
+      5
+      >>> find('Yorktown', 'x')
+      -1
+      >>> find('banana', 'a', 0, 2)
+      -1
+      >>> find('banana', 'a', 1, 2)
+      1
+      >>> find('banana', 'ana')
+      1
+      >>> find('banana', 'ana', 2)
+      3
+      >>> find('banana', 'nan', 0, 3)
+      -1
+      >>> find('Mississippi', 'ssi', 3, 2)
+      5
+      >>> find('abc', '')
+      -1
+    """
+    if not sub or index < 0 or index >= len(strng):
+        return -1
+    if step == 1:
+        return strng.find(sub, index)
+    if len(sub) == 1:
+        pos = strng[index::step].find(sub)
+        if pos == -1:
+            return -1
+        return index + pos * step
+    pos = strng.find(sub, index)
+    while pos != -1 and (pos - index) % step:
+        pos = strng.find(sub, pos + (index - pos) % step)
+    return pos
+
+
+def count_letters(word, ch):
+    """
+    Count the (possibly overlapping) occurrences of ch in word.
+
+      >>> count_letters('Yorktown', 'o')
+      2
+      >>> count_letters('Yorktown', 'w')
+      1
+      >>> count_letters('Yorktown', 'x')
+      0
+      >>> count_letters('banana', 'ana')
+      2
+      >>> count_letters('banana', '')
+      0
+    """
+    if not ch:
+        return 0
+    if len(ch) == 1:
+        return word.count(ch)
+    count = 0
+    index = word.find(ch)
+    while index != -1:
+        count += 1
+        index = word.find(ch, index + 1)
+    return count
+
+
+def find_all(haystacks, sub, index=0, step=1):
+    """
+    Search every string in haystacks for sub and return a list of the
+    positions found (-1 for a miss).
+
+      >>> find_all(['banana', 'bandana', 'cabana', 'bean'], 'ana')
+      [1, 4, 3, -1]
+      >>> find_all(['Yorktown', 'Boston'], 'o', 2)
+      [5, 4]
+    """
+    return [find(strng, sub, index, step) for strng in haystacks]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,172 @@
+#
+# balls.py
+#
+# Many balls bouncing around a box and off each other, with no gasp calls
+# so it can run headless.  Positions and velocities live in flat arrays,
+# one entry per ball.  To find the pairs that might touch, each ball is
+# dropped into a grid of cells one ball-width wide, and only balls in the
+# same or neighbouring cells are compared, using squared distances so no
+# square roots are taken.
+#
+import random
+import time
+from array import array
+
+# Cells to compare with a ball's own cell.  Only half of the neighbours
+# are listed so that each pair of cells is looked at once.
+NEIGHBOURS = [(1, 0), (-1, 1), (0, 1), (1, 1)]
+
+
+def new_world(count, width=800, height=600, radius=10, speed=4, seed=None):
+    """
+    Return a world of count balls at random positions with random
+    velocities, as a dictionary of arrays and settings.
+
+      >>> world = new_world(3, seed=1)
+      >>> len(world['x']), world['radius']
+      (3, 10)
+    """
+    rng = random.Random(seed)
+    world = {'width': width, 'height': height, 'radius': radius,
+             'x': array('d'), 'y': array('d'),
+             'dx': array('d'), 'dy': array('d')}
+    for i in xrange(count):
+        world['x'].append(rng.uniform(radius, width - radius))
+        world['y'].append(rng.uniform(radius, height - radius))
+        world['dx'].append(rng.uniform(-speed, speed))
+        world['dy'].append(rng.uniform(-speed, speed))
+    return world
+
+
+def move(world):
+    """
+    Move every ball by its velocity, bouncing off the walls.  A ball only
+    bounces while it is heading into a wall, so one that is already
+    touching a wall and moving away from it carries on.
+
+      >>> world = new_world(0)
+      >>> world['x'].append(9); world['y'].append(300)
+      >>> world['dx'].append(0.5); world['dy'].append(0)
+      >>> move(world); move(world)
+      >>> list(world['x']), list(world['dx'])
+      ([10.0], [0.5])
+    """
+    xs, ys, dxs, dys = world['x'], world['y'], world['dx'], world['dy']
+    r = world['radius']
+    right = world['width'] - r
+    top = world['height'] - r
+    for i in xrange(len(xs)):
+        x = xs[i] + dxs[i]
+        y = ys[i] + dys[i]
+        if (x <= r and dxs[i] < 0) or (x >= right and dxs[i] > 0):
+            dxs[i] = -dxs[i]
+        if (y <= r and dys[i] < 0) or (y >= top and dys[i] > 0):
+            dys[i] = -dys[i]
+        xs[i] = x
+        ys[i] = y
+
+
+def grid(world):
+    """
+    Return a dictionary mapping each occupied (column, row) cell to the
+    list of balls in it.
+    """
+    size = 2.0 * world['radius']
+    cells = {}
+    xs, ys = world['x'], world['y']
+    for i in xrange(len(xs)):
+        key = (int(xs[i] / size), int(ys[i] / size))
+        if key in cells:
+            cells[key].append(i)
+        else:
+            cells[key] = [i]
+    return cells
+
+
+def candidate_pairs(cells):
+    """
+    Generate the pairs of balls in the same or neighbouring cells, each
+    pair once.
+
+      >>> sorted(candidate_pairs({(0, 0): [0, 1], (1, 0): [2], (5, 5): [3]}))
+      [(0, 1), (0, 2), (1, 2)]
+    """
+    for (column, row), members in cells.iteritems():
+        for a in xrange(len(members)):
+            for b in xrange(a + 1, len(members)):
+                yield members[a], members[b]
+        for dc, dr in NEIGHBOURS:
+            others = cells.get((column + dc, row + dr))
+            if others:
+                for i in members:
+                    for j in others:
+                        yield i, j
+
+
+def collide(world, i, j):
+    # Equal-mass elastic collision: swap the velocity components along the
+    # line between the centres, if the balls are moving towards each other.
+    xs, ys, dxs, dys = world['x'], world['y'], world['dx'], world['dy']
+    nx = xs[j] - xs[i]
+    ny = ys[j] - ys[i]
+    closing = (dxs[j] - dxs[i]) * nx + (dys[j] - dys[i]) * ny
+    if closing >= 0:
+        return False
+    k = closing / (nx * nx + ny * ny)
+    dxs[i] += k * nx
+    dys[i] += k * ny
+    dxs[j] -= k * nx
+    dys[j] -= k * ny
+    return True
+
+
+def step(world):
+    """
+    Advance the world one tick and return the number of collisions.
+
+      >>> world = new_world(0)
+      >>> for x, dx in [(100, 2), (118, -2)]:
+      ...     world['x'].append(x); world['y'].append(300)
+      ...     world['dx'].append(dx); world['dy'].append(0)
+      >>> step(world)
+      1
+      >>> list(world['dx'])
+      [-2.0, 2.0]
+      >>> step(world)
+      0
+    """
+    move(world)
+    xs, ys = world['x'], world['y']
+    reach = (2.0 * world['radius'])**2
+    collisions = 0
+    for i, j in candidate_pairs(grid(world)):
+        ddx = xs[j] - xs[i]
+        ddy = ys[j] - ys[i]
+        if ddx * ddx + ddy * ddy < reach and collide(world, i, j):
+            collisions += 1
+    return collisions
+
+
+def benchmark(counts=(10, 100, 1000, 10000), ticks=100):
+    """
+    Print ticks and collisions per second for worlds of different sizes.
+    Each world's box is scaled so that the balls cover the same fraction
+    of it.
+    """
+    print "%8s %12s %14s %16s" % ("balls", "ticks/s", "collisions",
+                                  "collisions/s")
+    for count in counts:
+        scale = max(1.0, (count / 100.0)**0.5)
+        world = new_world(count, int(800 * scale), int(600 * scale), seed=1)
+        collisions = 0
+        start = time.time()
+        for i in xrange(ticks):
+            collisions += step(world)
+        elapsed = time.time() - start
+        print "%8d %12.1f %14d %16.0f" % (count, ticks / elapsed, collisions,
+                                          collisions / elapsed)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,50 +1,40 @@
-from gasp import *
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
 
-COMPUTER_WINS = 1
-PLAYER_WINS = 0
-QUIT = -1
+from gasp import *
+import gameloop
+from catch_physics import *
 
+KEYS = ['j', 'k', 'escape']
 
-def distance(x1, y1, x2, y2):
-        return ((x2 - x1)**2 + (y2 - y1)**2)**0.5
+# Run as "python catch3.py frames.csv" to see frame timings on screen and
+# save them to frames.csv at the end.
+STATS = gameloop.new_stats()
+SHOW_STATS = len(sys.argv) > 1
 
 
 def play_round():
-    ball_x = 10
-    ball_y = random_between(20, 280)
-    ball = Circle((ball_x, ball_y), 10, filled=True)
-    dx = 4
-    dy = random_between(-5, 5) 
+    state = new_round()
+    ball = Circle((state['ball_x'], state['ball_y']), 10, filled=True)
+    mitt = Circle((state['mitt_x'], state['mitt_y']), 20)
 
-    mitt_x = 780
-    mitt_y = random_between(20, 280)
-    mitt = Circle((mitt_x, mitt_y), 20)
+    def update():
+        keys = set([key for key in KEYS if key_pressed(key)])
+        return step(state, keys)
 
-    while True:
-        if ball_y >= 590 or ball_y <= 10:
-            dy *= -1
-        ball_x += dx
-        ball_y += dy
-        if ball_x >= 810:
-            remove_from_screen(ball)
-            remove_from_screen(mitt)
-            return COMPUTER_WINS 
-        move_to(ball, (ball_x, ball_y))
-
-        if key_pressed('k') and mitt_y <= 580:
-            mitt_y += 5
-        elif key_pressed('j') and mitt_y >= 20:
-            mitt_y -= 5
-        elif key_pressed('escape'):
-            return QUIT
-        move_to(mitt, (mitt_x, mitt_y))
-
-        if distance(ball_x, ball_y, mitt_x, mitt_y) <= 30:
-            remove_from_screen(ball)
-            remove_from_screen(mitt)
-            return PLAYER_WINS
+    def render():
+        move_to(ball, (state['ball_x'], state['ball_y']))
+        move_to(mitt, (state['mitt_x'], state['mitt_y']))
+        if SHOW_STATS:
+            overlay()
 
-        update_when('next_tick')
+    result = gameloop.run(update, render, 120, stats=STATS)
+    if result != QUIT:
+        remove_from_screen(ball)
+        remove_from_screen(mitt)
+    return result
 
 
 def play_game():
@@ -74,7 +64,8 @@ def play_game():
 
 
 begin_graphics(800, 600, title="Catch", background=color.YELLOW)
-set_speed(120)
+overlay = gameloop.overlay_updater(
+    STATS, lambda text: Text(text, (10, 10), size=12), remove_from_screen)
 
 result = play_game()
 
@@ -86,3 +77,6 @@ elif result == COMPUTER_WINS:
 sleep(4)
 
 end_graphics()
+
+if SHOW_STATS:
+    gameloop.write_csv(STATS, sys.argv[1])
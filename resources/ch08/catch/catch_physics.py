@@ -0,0 +1,106 @@
+#
+# catch_physics.py
+#
+# The ball and mitt movement of catch3.py without any gasp calls, so that
+# rounds can be played by the graphical game or simulated headless.
+#
+import random
+
+COMPUTER_WINS = 1
+PLAYER_WINS = 0
+QUIT = -1
+
+
+def distance(x1, y1, x2, y2):
+    return ((x2 - x1)**2 + (y2 - y1)**2)**0.5
+
+
+def new_round(rng=random):
+    """
+    Return the starting state of a round as a dictionary.
+
+      >>> state = new_round(random.Random(1))
+      >>> state['ball_x'], state['mitt_x'], state['dx']
+      (10, 780, 4)
+    """
+    return {'ball_x': 10, 'ball_y': rng.randint(20, 280),
+            'dx': 4, 'dy': rng.randint(-5, 5),
+            'mitt_x': 780, 'mitt_y': rng.randint(20, 280)}
+
+
+def step(state, keys):
+    """
+    Advance state by one tick with the set of pressed keys, and return
+    the result of the round, or None if it is still going.
+
+      >>> state = {'ball_x': 802, 'ball_y': 300, 'dx': 4, 'dy': 0,
+      ...          'mitt_x': 780, 'mitt_y': 100}
+      >>> step(state, set(['k']))
+      >>> state['ball_x'], state['mitt_y']
+      (806, 105)
+      >>> step(state, set())
+      1
+      >>> state = {'ball_x': 750, 'ball_y': 300, 'dx': 4, 'dy': 0,
+      ...          'mitt_x': 780, 'mitt_y': 300}
+      >>> step(state, set())
+      0
+      >>> step(state, set(['escape']))
+      -1
+    """
+    if state['ball_y'] >= 590 or state['ball_y'] <= 10:
+        state['dy'] *= -1
+    state['ball_x'] += state['dx']
+    state['ball_y'] += state['dy']
+    if state['ball_x'] >= 810:
+        return COMPUTER_WINS
+
+    if 'k' in keys and state['mitt_y'] <= 580:
+        state['mitt_y'] += 5
+    elif 'j' in keys and state['mitt_y'] >= 20:
+        state['mitt_y'] -= 5
+    elif 'escape' in keys:
+        return QUIT
+
+    if distance(state['ball_x'], state['ball_y'],
+                state['mitt_x'], state['mitt_y']) <= 30:
+        return PLAYER_WINS
+    return None
+
+
+def follow_ball(state):
+    """
+    A simple computer player: move the mitt towards the ball.
+    """
+    if state['ball_y'] > state['mitt_y']:
+        return set(['k'])
+    if state['ball_y'] < state['mitt_y']:
+        return set(['j'])
+    return set()
+
+
+def simulate(rounds, player=follow_ball, seed=None):
+    """
+    Play rounds rounds headless, as fast as possible, with player(state)
+    choosing the keys each tick.  Returns (player wins, computer wins).
+
+      >>> simulate(100, seed=1)
+      (100, 0)
+      >>> simulate(100, lambda state: set(), seed=1)[1] > 80
+      True
+    """
+    rng = random.Random(seed)
+    wins = [0, 0]
+    for i in xrange(rounds):
+        state = new_round(rng)
+        result = None
+        while result is None:
+            result = step(state, player(state))
+        if result == QUIT:
+            break
+        wins[result] += 1
+    return wins[PLAYER_WINS], wins[COMPUTER_WINS]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,10 +1,19 @@
+import sys
+
 from gasp import *
+import gameloop
 
 def distance((x1, y1), (x2, y2)):
     return ((x2 - x1)**2 + (y2 - y1)**2)**0.5
 
+# Run as "python collide.py frames.csv" to see frame timings on screen and
+# save them to frames.csv at the end.
+stats = gameloop.new_stats()
+show_stats = len(sys.argv) > 1
+
 begin_graphics(800, 600, title="Catch", background=color.YELLOW)
-set_speed(120)
+overlay = gameloop.overlay_updater(
+    stats, lambda text: Text(text, (10, 10), size=12), remove_from_screen)
 
 ball1_x = 10
 ball1_y = 300
@@ -16,15 +25,26 @@ ball2_y = 300
 ball2 = Circle((ball2_x, ball2_y), 10)
 ball2_dx = -4
 
-while ball1_x < 810:
+def update():
+    global ball1_x, ball2_x
     ball1_x += ball1_dx
     ball2_x += ball2_dx
+    if distance((ball1_x, ball1_y), (ball2_x, ball2_y)) < 20:
+        return 'collided'
+    if ball1_x >= 810:
+        return 'missed'
+
+def render():
     move_to(ball1, (ball1_x, ball1_y))
     move_to(ball2, (ball2_x, ball2_y))
-    if distance((ball1_x, ball1_y), (ball2_x, ball2_y)) < 20:
-        remove_from_screen(ball1)
-        remove_from_screen(ball2)
-        break
-    update_when('next_tick')
+    if show_stats:
+        overlay()
+
+if gameloop.run(update, render, 120, stats=stats) == 'collided':
+    remove_from_screen(ball1)
+    remove_from_screen(ball2)
 
 end_graphics()
+
+if show_stats:
+    gameloop.write_csv(stats, sys.argv[1])
@@ -0,0 +1,143 @@
+#
+# gameloop.py
+#
+# A fixed-timestep game loop.  The game's update function always advances
+# by the same amount of game time, however long drawing takes: when a frame
+# runs late, several updates are run before the next render to catch up,
+# up to a cap so that a very slow frame cannot snowball.  Every frame's
+# timing is recorded so slow frames can be seen on screen or in a CSV file.
+#
+import time
+
+CSV_HEADER = "frame,updates,update_ms,render_ms,overrun\n"
+
+
+def new_stats():
+    """
+    Return an empty record of frame timings: 'frames' is a list of
+    (updates, update_ms, render_ms, overrun) tuples, one per frame, and
+    'overruns' counts the frames that could not catch up.
+    """
+    return {'frames': [], 'overruns': 0}
+
+
+def run(update, render, rate=120, max_updates=5, stats=None,
+        clock=time.time, sleep=time.sleep):
+    """
+    Call update() rate times per second of real time and render() once per
+    frame, until update returns something other than None, which is then
+    returned.  At most max_updates updates are run between two renders;
+    any time still owed after that is dropped and the frame is counted as
+    an overrun.
+
+      >>> ticks = [0.0]
+      >>> def clock():
+      ...     return ticks[0]
+      >>> def sleep(seconds):
+      ...     ticks[0] += seconds
+      >>> def render():
+      ...     ticks[0] += 0.025           # a slow frame: 2.5 ticks long
+      >>> count = [0]
+      >>> def update():
+      ...     count[0] += 1
+      ...     if count[0] == 10:
+      ...         return 'done'
+      >>> stats = new_stats()
+      >>> run(update, render, 100, 2, stats, clock, sleep)
+      'done'
+      >>> [frame[0] for frame in stats['frames']]
+      [1, 2, 2, 2, 2, 1]
+      >>> stats['overruns']
+      2
+    """
+    if stats is None:
+        stats = new_stats()
+    frames = stats['frames']
+    dt = 1.0 / rate
+    lag = dt
+    previous = clock()
+    while True:
+        now = clock()
+        lag += now - previous
+        previous = now
+
+        updates = 0
+        started = clock()
+        while lag >= dt and updates < max_updates:
+            result = update()
+            updates += 1
+            lag -= dt
+            if result is not None:
+                frames.append((updates, (clock() - started) * 1000, 0.0,
+                               False))
+                return result
+        update_ms = (clock() - started) * 1000
+
+        overrun = lag >= dt
+        if overrun:
+            stats['overruns'] += 1
+            lag = 0.0
+
+        started = clock()
+        render()
+        render_ms = (clock() - started) * 1000
+        frames.append((updates, update_ms, render_ms, overrun))
+
+        spent = clock() - previous
+        if lag + spent < dt:
+            sleep(dt - lag - spent)
+
+
+def summary(stats, last=60):
+    """
+    Return a one-line summary of the last frames, for an on-screen overlay.
+
+      >>> stats = {'frames': [(1, 0.5, 2.0, False), (2, 1.5, 4.0, True)],
+      ...          'overruns': 1}
+      >>> summary(stats)
+      'update 1.00 ms  render 3.00 ms  overruns 1'
+    """
+    frames = stats['frames'][-last:]
+    if not frames:
+        return 'no frames yet'
+    update_ms = sum([frame[1] for frame in frames]) / len(frames)
+    render_ms = sum([frame[2] for frame in frames]) / len(frames)
+    return "update %.2f ms  render %.2f ms  overruns %d" % (
+        update_ms, render_ms, stats['overruns'])
+
+
+def overlay_updater(stats, make_text, remove, every=60):
+    """
+    Return a function to call once per frame that replaces an on-screen
+    summary every few frames.  make_text(string) draws a text object and
+    returns it; remove(text) takes it off the screen (with gasp, pass a
+    function that makes a Text and remove_from_screen).
+    """
+    shown = [None, 0]
+
+    def refresh():
+        shown[1] += 1
+        if shown[1] % every == 1 or every == 1:
+            if shown[0] is not None:
+                remove(shown[0])
+            shown[0] = make_text(summary(stats, every))
+
+    return refresh
+
+
+def write_csv(stats, filename):
+    """
+    Write the recorded frames to filename as CSV.
+    """
+    f = open(filename, 'w')
+    f.write(CSV_HEADER)
+    for i, (updates, update_ms, render_ms, overrun) in enumerate(
+            stats['frames']):
+        f.write("%d,%d,%.3f,%.3f,%d\n" %
+                (i, updates, update_ms, render_ms, overrun))
+    f.close()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,34 @@
+import sys
+
+from gasp import *
+import balls
+import gameloop
+
+# Run as "python many_balls.py [count]"; press escape to stop.
+if len(sys.argv) > 1:
+    count = int(sys.argv[1])
+else:
+    count = 50
+
+begin_graphics(800, 600, title="Collide", background=color.YELLOW)
+
+world = balls.new_world(count)
+circles = [Circle((world['x'][i], world['y'][i]), world['radius'])
+           for i in range(count)]
+collisions = [0]
+message = [Text("Collisions: 0", (10, 570), size=16)]
+
+def update():
+    collisions[0] += balls.step(world)
+    if key_pressed('escape'):
+        return True
+
+def render():
+    for i in range(count):
+        move_to(circles[i], (world['x'][i], world['y'][i]))
+    remove_from_screen(message[0])
+    message[0] = Text("Collisions: %d" % collisions[0], (10, 570), size=16)
+
+gameloop.run(update, render, 60)
+
+end_graphics()
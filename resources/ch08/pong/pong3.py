@@ -1,62 +1,51 @@
-from gasp import *
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
 
-PLAYER1_WINS = 1
-PLAYER2_WINS = -1
-QUIT = 0 
+from gasp import *
+import gameloop
+import scene
+from pong_physics import *
 
+KEYS = ['j', 'k', 'a', 's', 'escape']
 
-def hit(bx, by, r, px, py, h):
-    return py <= by <= py + h and abs(px - bx) <= r
+# Run as "python pong3.py frames.csv" to see frame timings on screen and
+# save them to frames.csv at the end.
+STATS = gameloop.new_stats()
+SHOW_STATS = len(sys.argv) > 1
+SCENE = scene.new_scene(move_to)
 
 
 def play_round():
-    bx = 400
-    by = 300 
-    ball = Circle((bx, by), 10, filled=True)
-    dx = 4 * (-1)**random_between(0, 1)
-    dy = random_between(1, 5) * (-1)**random_between(0, 1) 
-
-    p1x = 780
-    p1y = 250
-    p1 = Box((p1x, p1y), 10, 100, filled=True)
-
-    p2x = 20
-    p2y = 250
-    p2 = Box((p2x, p2y), 10, 100, filled=True)
-
-    while True:
-        if by >= 590 or by <= 10:
-            dy *= -1
-        bx += dx
-        by += dy
-        if bx <= -10 or bx >= 810:
-            remove_from_screen(ball)
-            remove_from_screen(p1)
-            remove_from_screen(p2)
-            if bx <= -10:
-                return PLAYER1_WINS 
-            else:
-                return PLAYER2_WINS
-        move_to(ball, (bx, by))
-
-        # check for key pressed event and move p1 and p2 appropriately
-        if key_pressed('k') and p1y <= 500:
-            p1y += 5
-        elif key_pressed('j') and p1y >= 0:
-            p1y -= 5
-        if key_pressed('s') and p2y <= 500:
-            p2y += 5
-        elif key_pressed('a') and p2y >= 0:
-            p2y -= 5
-        if key_pressed('escape'):
-            return QUIT
-        move_to(p1, (p1x, p1y))
-        move_to(p2, (p2x, p2y))
-
-        if hit(bx, by, 10, p1x, p1y, 100) or hit(bx, by, 10, p2x+10, p2y, 100):
-            dx *= -1
-
-        update_when('next_tick')
+    state = new_round()
+    ball = Circle((state['bx'], state['by']), 10, filled=True)
+    p1 = Box((state['p1x'], state['p1y']), 10, 100, filled=True)
+    p2 = Box((state['p2x'], state['p2y']), 10, 100, filled=True)
+    scene.add(SCENE, ball, (state['bx'], state['by']))
+    scene.add(SCENE, p1, (state['p1x'], state['p1y']))
+    scene.add(SCENE, p2, (state['p2x'], state['p2y']))
+
+    def update():
+        keys = set([key for key in KEYS if key_pressed(key)])
+        return step(state, keys)
+
+    def render():
+        scene.place(SCENE, ball, (state['bx'], state['by']))
+        scene.place(SCENE, p1, (state['p1x'], state['p1y']))
+        scene.place(SCENE, p2, (state['p2x'], state['p2y']))
+        scene.flush(SCENE)
+        if SHOW_STATS:
+            overlay()
+
+    result = gameloop.run(update, render, 120, stats=STATS)
+    for obj in [ball, p1, p2]:
+        scene.remove(SCENE, obj)
+    if result != QUIT:
+        remove_from_screen(ball)
+        remove_from_screen(p1)
+        remove_from_screen(p2)
+    return result
 
 
 def play_game():
@@ -86,7 +75,8 @@ def play_game():
 
 
 begin_graphics(800, 600, title="Catch", background=color.YELLOW)
-set_speed(120)
+overlay = gameloop.overlay_updater(
+    STATS, lambda text: Text(text, (300, 10), size=12), remove_from_screen)
 
 result = play_game()
 
@@ -98,3 +88,7 @@ elif result == PLAYER2_WINS:
 sleep(4)
 
 end_graphics()
+
+if SHOW_STATS:
+    gameloop.write_csv(STATS, sys.argv[1])
+    print scene.report(SCENE)
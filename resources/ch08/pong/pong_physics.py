@@ -0,0 +1,123 @@
+#
+# pong_physics.py
+#
+# The ball and paddle movement of pong3.py without any gasp calls, so that
+# rounds can be played by the graphical game or simulated headless.
+#
+import random
+
+PLAYER1_WINS = 1
+PLAYER2_WINS = -1
+QUIT = 0
+
+
+def hit(bx, by, r, px, py, h):
+    return py <= by <= py + h and abs(px - bx) <= r
+
+
+def new_round(rng=random):
+    """
+    Return the starting state of a round as a dictionary.
+
+      >>> state = new_round(random.Random(1))
+      >>> state['bx'], state['by'], state['p1y'], state['p2y']
+      (400, 300, 250, 250)
+    """
+    return {'bx': 400, 'by': 300,
+            'dx': 4 * (-1)**rng.randint(0, 1),
+            'dy': rng.randint(1, 5) * (-1)**rng.randint(0, 1),
+            'p1x': 780, 'p1y': 250, 'p2x': 20, 'p2y': 250}
+
+
+def step(state, keys):
+    """
+    Advance state by one tick with the set of pressed keys, and return
+    the result of the round, or None if it is still going.
+
+      >>> state = {'bx': 766, 'by': 300, 'dx': 4, 'dy': 0,
+      ...          'p1x': 780, 'p1y': 250, 'p2x': 20, 'p2y': 250}
+      >>> step(state, set(['k', 'a']))
+      >>> state['bx'], state['dx'], state['p1y'], state['p2y']
+      (770, -4, 255, 245)
+      >>> state['bx'] = -6
+      >>> step(state, set())
+      1
+    """
+    if state['by'] >= 590 or state['by'] <= 10:
+        state['dy'] *= -1
+    state['bx'] += state['dx']
+    state['by'] += state['dy']
+    if state['bx'] <= -10:
+        return PLAYER1_WINS
+    if state['bx'] >= 810:
+        return PLAYER2_WINS
+
+    if 'k' in keys and state['p1y'] <= 500:
+        state['p1y'] += 5
+    elif 'j' in keys and state['p1y'] >= 0:
+        state['p1y'] -= 5
+    if 's' in keys and state['p2y'] <= 500:
+        state['p2y'] += 5
+    elif 'a' in keys and state['p2y'] >= 0:
+        state['p2y'] -= 5
+    if 'escape' in keys:
+        return QUIT
+
+    if (hit(state['bx'], state['by'], 10, state['p1x'], state['p1y'], 100) or
+            hit(state['bx'], state['by'], 10, state['p2x'] + 10,
+                state['p2y'], 100)):
+        state['dx'] *= -1
+    return None
+
+
+def follow_ball(state):
+    """
+    Computer players for both paddles: each moves its paddle's middle
+    towards the ball.
+    """
+    keys = set()
+    if state['by'] > state['p1y'] + 50:
+        keys.add('k')
+    elif state['by'] < state['p1y'] + 50:
+        keys.add('j')
+    if state['by'] > state['p2y'] + 50:
+        keys.add('s')
+    elif state['by'] < state['p2y'] + 50:
+        keys.add('a')
+    return keys
+
+
+def simulate(rounds, players=follow_ball, seed=None, max_ticks=100000):
+    """
+    Play rounds rounds headless, as fast as possible, with players(state)
+    choosing the keys each tick.  A round that lasts max_ticks ticks is
+    counted as a draw.  Returns (player 1 wins, player 2 wins, draws).
+
+      >>> simulate(20, lambda state: set(), seed=1)
+      (10, 10, 0)
+      >>> simulate(3, seed=1, max_ticks=1000)
+      (0, 0, 3)
+    """
+    rng = random.Random(seed)
+    p1_wins = p2_wins = draws = 0
+    for i in xrange(rounds):
+        state = new_round(rng)
+        result = None
+        ticks = 0
+        while result is None and ticks < max_ticks:
+            result = step(state, players(state))
+            ticks += 1
+        if result == PLAYER1_WINS:
+            p1_wins += 1
+        elif result == PLAYER2_WINS:
+            p2_wins += 1
+        elif result == QUIT:
+            break
+        else:
+            draws += 1
+    return p1_wins, p2_wins, draws
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,76 @@
+#
+# scene.py
+#
+# Collects the position changes made during a tick and sends them to the
+# screen together in flush(), skipping objects that end the tick where
+# they were last drawn.  The drawing function is passed in (gasp's move_to
+# in the games), so this module does not need gasp itself.
+#
+
+
+def new_scene(move_to):
+    """
+    Return an empty scene that draws with move_to(obj, position).
+    """
+    return {'move_to': move_to, 'objects': {}, 'moves': 0, 'skipped': 0}
+
+
+def add(scene, obj, position):
+    """
+    Start tracking obj, which is already drawn at position.
+    """
+    scene['objects'][id(obj)] = [obj, position, position]
+
+
+def remove(scene, obj):
+    del scene['objects'][id(obj)]
+
+
+def place(scene, obj, position):
+    """
+    Record that obj should be at position.  Nothing is drawn until flush.
+    """
+    scene['objects'][id(obj)][2] = position
+
+
+def flush(scene):
+    """
+    Move every object whose position changed since the last flush, once,
+    and return how many moved.
+
+      >>> moves = []
+      >>> s = new_scene(lambda obj, position: moves.append((obj, position)))
+      >>> add(s, 'ball', (0, 0)); add(s, 'paddle', (5, 0))
+      >>> place(s, 'ball', (1, 1)); place(s, 'ball', (2, 2))
+      >>> place(s, 'paddle', (5, 0))
+      >>> flush(s)
+      1
+      >>> moves
+      [('ball', (2, 2))]
+      >>> flush(s)
+      0
+      >>> report(s)
+      '1 redraws, 3 avoided'
+    """
+    moved = 0
+    for entry in scene['objects'].itervalues():
+        obj, drawn, wanted = entry
+        if wanted != drawn:
+            scene['move_to'](obj, wanted)
+            entry[1] = wanted
+            moved += 1
+    scene['moves'] += moved
+    scene['skipped'] += len(scene['objects']) - moved
+    return moved
+
+
+def report(scene):
+    """
+    Return a line saying how many redraws were made and avoided.
+    """
+    return "%d redraws, %d avoided" % (scene['moves'], scene['skipped'])
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
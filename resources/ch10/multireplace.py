@@ -0,0 +1,146 @@
+#
+# multireplace.py
+#
+import re
+
+
+MAX_NESTING = 100        # deeper tries fall back to a plain alternation
+
+
+def _trie_pattern(trie):
+    # Each node maps a character to a child node; the key '' marks the end
+    # of a word.  Trying longer branches first and making the tail optional
+    # gives leftmost-longest matches.  Nodes are finished children first,
+    # using an explicit stack so that long keys cannot exhaust the Python
+    # stack.  Returns the pattern and how deeply its groups nest.
+    done = {}
+    stack = [(trie, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not expanded:
+            stack.append((node, True))
+            for ch in node:
+                if ch:
+                    stack.append((node[ch], False))
+            continue
+        branches = []
+        nesting = 0
+        for ch in sorted(node):
+            if ch:
+                pattern, depth = done.pop(id(node[ch]))
+                branches.append(re.escape(ch) + pattern)
+                nesting = max(nesting, depth)
+        if not branches:
+            done[id(node)] = ('', 0)
+            continue
+        if len(branches) == 1:
+            pattern = branches[0]
+        else:
+            pattern = '(?:' + '|'.join(branches) + ')'
+            nesting += 1
+        if '' in node:
+            if len(branches) == 1:
+                pattern = '(?:' + pattern + ')'
+                nesting += 1
+            pattern += '?'
+        done[id(node)] = (pattern, nesting)
+    return done[id(trie)]
+
+
+def compile_replacements(mapping):
+    """
+    Compile a dictionary of old -> new substitutions so that they can all be
+    applied in a single scan.  Returns a (regex, mapping, longest) tuple to
+    pass to the other functions in this module.  The keys are merged into a
+    trie-shaped pattern, unless its groups would nest more than MAX_NESTING
+    deep, in which case the keys are simply listed longest first.
+
+      >>> regex, mapping, longest = compile_replacements({'a': 'b', 'abc': 'x'})
+      >>> regex.pattern
+      'a(?:bc)?'
+      >>> longest
+      3
+      >>> compiled = compile_replacements({'a' * 1200: 'b', 'a' * 1199: 'c'})
+      >>> multireplace('a' * 2399, compiled)
+      'bc'
+    """
+    trie = {}
+    for old in mapping:
+        if not old:
+            raise ValueError('cannot replace the empty string')
+        node = trie
+        for ch in old:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    longest = max([len(old) for old in mapping] or [0])
+    pattern, nesting = _trie_pattern(trie)
+    if nesting > MAX_NESTING:
+        keys = sorted(mapping, key=len, reverse=True)
+        pattern = '|'.join([re.escape(old) for old in keys])
+    return re.compile(pattern), dict(mapping), longest
+
+
+def multireplace(s, compiled):
+    """
+    Apply every substitution in compiled to s in one pass.  Where several
+    keys match at the same position the longest one wins, and replaced text
+    is never scanned again.
+
+      >>> compiled = compile_replacements({'i': 'I', 'ss': 'SS', 'issi': '!'})
+      >>> multireplace('Mississippi', compiled)
+      'M!SSIppI'
+      >>> compiled = compile_replacements({'spom': 'spam', 'Spom': 'Spam'})
+      >>> multireplace('I love spom!  Spom is my favorite food.', compiled)
+      'I love spam!  Spam is my favorite food.'
+      >>> multireplace('abba', compile_replacements({'a': 'b', 'b': 'a'}))
+      'baab'
+      >>> multireplace('nothing here', compile_replacements({}))
+      'nothing here'
+    """
+    regex, mapping, longest = compiled
+    if not mapping:
+        return s
+    return regex.sub(lambda match: mapping[match.group()], s)
+
+
+def multireplace_file(infile, outfile, compiled, chunksize=65536):
+    """
+    Copy infile to outfile applying every substitution in compiled.  The
+    input is read chunksize characters at a time, so memory use stays
+    bounded by the chunk size plus the longest key.
+
+      >>> from StringIO import StringIO
+      >>> compiled = compile_replacements({'an': 'AN', 'ban': 'BAN'})
+      >>> out = StringIO()
+      >>> multireplace_file(StringIO('banana bandana ' * 3), out, compiled, 4)
+      >>> out.getvalue()
+      'BANANa BANdANa BANANa BANdANa BANANa BANdANa '
+    """
+    regex, mapping, longest = compiled
+    carry = ''
+    while True:
+        chunk = infile.read(chunksize)
+        buffer = carry + chunk
+        if not chunk:
+            outfile.write(multireplace(buffer, compiled))
+            return
+        # A match starting before limit cannot grow any longer once more
+        # input arrives, so everything up to there is final.
+        limit = len(buffer) - longest + 1
+        pos = 0
+        if mapping:
+            match = regex.search(buffer, pos)
+            while match and match.start() < limit:
+                outfile.write(buffer[pos:match.start()])
+                outfile.write(mapping[match.group()])
+                pos = match.end()
+                match = regex.search(buffer, pos)
+        if pos < limit:
+            outfile.write(buffer[pos:limit])
+            pos = limit
+        carry = buffer[pos:]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
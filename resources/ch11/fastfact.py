@@ -0,0 +1,97 @@
+#
+# fastfact.py
+#
+import time
+from multiprocessing import Pool
+
+
+def product(lo, hi):
+    """
+    Return lo * (lo+1) * ... * (hi-1), multiplying the two halves of the
+    range separately so that the big multiplications are between numbers
+    of about the same size.
+
+      >>> product(1, 6)
+      120
+      >>> product(5, 5)
+      1
+    """
+    if hi - lo <= 8:
+        result = 1
+        for number in xrange(lo, hi):
+            result *= number
+        return result
+    middle = (lo + hi) / 2
+    return product(lo, middle) * product(middle, hi)
+
+
+def _product_task(bounds):
+    return product(*bounds)
+
+
+def _multiply_all(numbers):
+    # Multiply a list of numbers pairwise, like the levels of a tree.
+    while len(numbers) > 1:
+        pairs = [numbers[i] * numbers[i + 1]
+                 for i in xrange(0, len(numbers) - 1, 2)]
+        if len(numbers) % 2:
+            pairs.append(numbers[-1])
+        numbers = pairs
+    return numbers[0]
+
+
+def factorial(n, processes=1):
+    """
+    Return n! using a balanced product tree.  With processes > 1 the range
+    is split into that many pieces whose products are computed in a process
+    pool, and the partial products are then multiplied pairwise.
+
+      >>> [factorial(n) for n in range(7)]
+      [1, 1, 2, 6, 24, 120, 720]
+      >>> factorial(100) == factorial(100, processes=3)
+      True
+    """
+    if n < 0:
+        raise ValueError('factorial is not defined for negative numbers')
+    if processes <= 1 or n < 1000:
+        return product(2, n + 1)
+    bounds = []
+    lo = 2
+    for i in range(processes, 0, -1):
+        hi = lo + (n + 1 - lo) / i
+        bounds.append((lo, hi))
+        lo = hi
+    pool = Pool(processes)
+    try:
+        return _multiply_all(pool.map(_product_task, bounds))
+    finally:
+        pool.terminate()
+
+
+def benchmark(sizes=(10**4, 10**5, 10**6), processes=2, naive_limit=10**5):
+    """
+    Print timings of ch11e10.factorial (up to naive_limit, since it is
+    quadratic) against factorial() with one and with several processes.
+    """
+    import ch11e10
+
+    print "%-10s %12s %12s %12s" % ("n", "ch11e10 (s)", "tree (s)",
+                                    "pool (s)")
+    for n in sizes:
+        naive = '-'
+        if n <= naive_limit:
+            start = time.time()
+            ch11e10.factorial(n)
+            naive = "%.3f" % (time.time() - start)
+        start = time.time()
+        factorial(n)
+        tree = time.time() - start
+        start = time.time()
+        factorial(n, processes)
+        pool = time.time() - start
+        print "%-10d %12s %12.3f %12.3f" % (n, naive, tree, pool)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,77 @@
+#
+# fastfib.py
+#
+# Same convention as tail_recursion.fibonacci: fibonacci(0) == fibonacci(1)
+# == 1, so fibonacci(n) is the usual F(n+1).
+#
+from collections import OrderedDict
+
+CACHE_SIZE = 1024
+SMALL_LIMIT = 10000     # only answers for n below this are remembered
+_cache = OrderedDict()
+
+
+def _fib_pair(n):
+    # Return (F(n), F(n+1)) for the usual F(0) = 0, F(1) = 1, working down
+    # the bits of n with the fast-doubling identities
+    #     F(2k) = F(k) * (2*F(k+1) - F(k))
+    #     F(2k+1) = F(k)**2 + F(k+1)**2
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        a, b = a * (2*b - a), a*a + b*b
+        if bit == '1':
+            a, b = b, a + b
+    return a, b
+
+
+def fibonacci(n):
+    """
+    Return the nth Fibonacci number in O(log n) big-integer steps.  The
+    most recent CACHE_SIZE answers for n below SMALL_LIMIT are remembered;
+    larger answers are recomputed, since each can run to millions of
+    digits.
+
+      >>> [fibonacci(n) for n in range(10)]
+      [1, 1, 2, 3, 5, 8, 13, 21, 34, 55]
+      >>> fibonacci(35)
+      14930352
+      >>> len(str(fibonacci(10**5)))
+      20899
+      >>> 10**5 in _cache
+      False
+    """
+    if n < 0:
+        raise ValueError('fibonacci is not defined for negative numbers')
+    if n >= SMALL_LIMIT:
+        return _fib_pair(n)[1]
+    if n in _cache:
+        value = _cache.pop(n)
+    else:
+        value = _fib_pair(n)[1]
+        if len(_cache) >= CACHE_SIZE:
+            _cache.popitem(last=False)
+    _cache[n] = value
+    return value
+
+
+def fibonacci_range(start, stop):
+    """
+    Generate fibonacci(n) for start <= n < stop, doing the fast-doubling
+    work once and then one addition per number.
+
+      >>> list(fibonacci_range(5, 10))
+      [8, 13, 21, 34, 55]
+      >>> list(fibonacci_range(3, 3))
+      []
+    """
+    if start >= stop:
+        return
+    a, b = _fib_pair(start + 1)
+    for n in xrange(start, stop):
+        yield a
+        a, b = b, a + b
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
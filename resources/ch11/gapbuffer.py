@@ -0,0 +1,102 @@
+#
+# gapbuffer.py
+#
+# A gap buffer keeps a sequence in a list with a block of unused slots
+# (the gap) at the last place something was inserted.  Inserting next to
+# the gap only fills a slot, so repeated inserts at or near the same spot,
+# like repeated seqtools.insert_in_middle calls, cost amortized O(1)
+# instead of copying the whole sequence each time.
+#
+# A buffer is a list [items, gap_start, gap_end, kind], where kind is the
+# type of the sequence it was made from.
+#
+from seqtools import encapsulate
+
+
+def make_buffer(seq, gap=16):
+    """
+      >>> buf = make_buffer('abc')
+      >>> length(buf), to_sequence(buf)
+      (3, 'abc')
+    """
+    return [list(seq) + [None] * gap, len(seq), len(seq) + gap, type(seq)]
+
+
+def length(buf):
+    items, start, end, kind = buf
+    return len(items) - (end - start)
+
+
+def _move_gap(buf, index):
+    items, start, end, kind = buf
+    if index < start:
+        # Shift items[index:start] up to just below the end of the gap.
+        moved = start - index
+        items[end - moved:end] = items[index:start]
+        start, end = index, end - moved
+    elif index > start:
+        moved = index - start
+        items[start:index] = items[end:end + moved]
+        start, end = index, end + moved
+    buf[1], buf[2] = start, end
+
+
+def _grow(buf, needed):
+    items, start, end, kind = buf
+    extra = max(needed, len(items))
+    buf[0] = items[:start] + [None] * (end - start + extra) + items[end:]
+    buf[2] = end + extra
+
+
+def insert(buf, index, seq):
+    """
+    Insert the items of seq at position index.
+
+      >>> buf = make_buffer([1, 2, 3], gap=1)
+      >>> insert(buf, 1, ['a', 'b'])
+      >>> insert(buf, 0, [0])
+      >>> to_sequence(buf)
+      [0, 1, 'a', 'b', 2, 3]
+    """
+    if not 0 <= index <= length(buf):
+        raise IndexError('insert index out of range')
+    if buf[2] - buf[1] < len(seq):
+        _grow(buf, len(seq))
+    _move_gap(buf, index)
+    items, start = buf[0], buf[1]
+    items[start:start + len(seq)] = list(seq)
+    buf[1] = start + len(seq)
+
+
+def insert_in_middle(val, buf):
+    """
+    In-place version of seqtools.insert_in_middle.
+
+      >>> buf = make_buffer('Python')
+      >>> insert_in_middle('!', buf)
+      >>> to_sequence(buf)
+      'Pyt!hon'
+      >>> buf = make_buffer((1, 2, 3, 4))
+      >>> for i in range(5):
+      ...     insert_in_middle(i, buf)
+      >>> to_sequence(buf)
+      (1, 2, 1, 3, 4, 2, 0, 3, 4)
+    """
+    insert(buf, length(buf) / 2, encapsulate(val, buf[3]()))
+
+
+def to_sequence(buf):
+    """
+    Return the contents as a sequence of the type the buffer was made
+    from.
+    """
+    items, start, end, kind = buf
+    contents = items[:start] + items[end:]
+    if kind == type(""):
+        return ''.join(contents)
+    return kind(contents)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
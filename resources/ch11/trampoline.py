@@ -0,0 +1,119 @@
+#
+# trampoline.py
+#
+# Run recursive functions on an explicit stack instead of the Python call
+# stack, so recursion depth is limited only by memory.  A function is
+# written as a generator: it yields a recursive call to get that call's
+# result, and yields a plain value to return it.
+#
+#     @trampoline
+#     def factorial(n):
+#         if n == 0:
+#             yield 1
+#         else:
+#             yield n * (yield factorial(n-1))
+#
+import threading
+import time
+from functools import wraps
+from types import GeneratorType
+
+_state = threading.local()
+
+
+def _run(generator):
+    stack = [generator]
+    value = None
+    error = None
+    while stack:
+        top = stack[-1]
+        try:
+            if error is not None:
+                e, error = error, None
+                result = top.throw(e)
+            else:
+                result = top.send(value)
+        except StopIteration:
+            stack.pop()
+            value = None
+            continue
+        except Exception, e:
+            stack.pop()
+            if not stack:
+                raise
+            error = e
+            continue
+        if isinstance(result, GeneratorType):
+            stack.append(result)
+            value = None
+        else:
+            stack.pop().close()
+            value = result
+    return value
+
+
+def trampoline(function):
+    """
+    Decorate a generator-style recursive function so that calling it runs
+    on an explicit stack.  Inside a running trampoline, calls just create
+    the generator for the executor to push.
+
+      >>> @trampoline
+      ... def factorial(n):
+      ...     if n == 0:
+      ...         yield 1
+      ...     else:
+      ...         yield n * (yield factorial(n-1))
+      >>> factorial(5)
+      120
+      >>> len(str(factorial(20000)))
+      77338
+      >>> @trampoline
+      ... def depth(n):
+      ...     if n == 0:
+      ...         raise ValueError('bottom')
+      ...     yield (yield depth(n-1))
+      >>> depth(100000)
+      Traceback (most recent call last):
+        ...
+      ValueError: bottom
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if getattr(_state, 'running', False):
+            return function(*args, **kwargs)
+        _state.running = True
+        try:
+            return _run(function(*args, **kwargs))
+        finally:
+            _state.running = False
+    return wrapper
+
+
+def benchmark(n=500, repeat=200):
+    """
+    Print the time per call of a natively recursive factorial and the
+    trampolined one for n (which must fit under the recursion limit).
+    """
+    def native(n):
+        if n == 0:
+            return 1
+        return n * native(n-1)
+
+    @trampoline
+    def stacked(n):
+        if n == 0:
+            yield 1
+        else:
+            yield n * (yield stacked(n-1))
+
+    for name, function in [('native', native), ('trampoline', stacked)]:
+        start = time.time()
+        for i in xrange(repeat):
+            function(n)
+        print "%-12s %10.1f us" % (name, (time.time() - start) / repeat * 1e6)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,14 +1,31 @@
 #! /usr/bin/env python
 
+import cPickle
+import heapq
+import json
 import os
+import posixpath
 import sys
+import tarfile
+import threading
+import time
+from multiprocessing.pool import ThreadPool
 
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
 
-def getroot():
-    if len(sys.argv) == 1:
-        path = ''
-    else:
-        path = sys.argv[1]
+
+def getroot(path=None):
+    if path is None:
+        if len(sys.argv) == 1:
+            path = ''
+        else:
+            path = sys.argv[1]
 
     if os.path.isabs(path):
         tree_root = path
@@ -25,16 +42,336 @@ def getdirlist(path):
     return dirlist
 
 
-def traverse(path):
-    dirlist = getdirlist(path)
-    for file in dirlist:
-        if os.path.isfile(os.path.join(path, file)):
-            print os.path.join(path, file)
+def getentries(path):
+    """
+    Return a sorted list of (name, full path, is_file) triples for the
+    entries of path, skipping dot-files like getdirlist does.  When scandir
+    is available the file type comes from the directory listing itself
+    instead of a stat call per entry.
+    """
+    if scandir is None:
+        return [(name, os.path.join(path, name),
+                 os.path.isfile(os.path.join(path, name)))
+                for name in getdirlist(path)]
+    entries = [(entry.name, entry.path, entry.is_file())
+               for entry in scandir(path) if entry.name[0] != '.']
+    entries.sort()
+    return entries
+
+
+def getsizedentries(path):
+    """
+    Like getentries, but each entry also carries its size in bytes (0 for
+    directories).  Every file still costs one stat call for its size; only
+    the is_file check comes free from the directory listing.
+    """
+    if scandir is None:
+        entries = []
+        for name, fullpath, is_file in getentries(path):
+            size = 0
+            if is_file:
+                size = os.stat(fullpath).st_size
+            entries.append((name, fullpath, is_file, size))
+        return entries
+    entries = []
+    for entry in scandir(path):
+        if entry.name[0] != '.':
+            is_file = entry.is_file()
+            size = 0
+            if is_file:
+                size = entry.stat().st_size
+            entries.append((entry.name, entry.path, is_file, size))
+    return entries
+
+
+def walk(path, lister=getentries):
+    """
+    Generate the paths below path in the order traverse prints them,
+    keeping the directories still to finish on an explicit stack rather
+    than recursing.  lister(path) is called to get each directory's
+    entries, in the form getentries returns them.
+    """
+    stack = [iter(lister(path))]
+    while stack:
+        for name, fullpath, is_file in stack[-1]:
+            yield fullpath
+            if not is_file:
+                stack.append(iter(lister(fullpath)))
+                break
+        else:
+            stack.pop()
+
+
+def parallel_lister(pool, max_pending=1000):
+    """
+    Return a lister for walk that reads directories ahead of the walk on
+    the threads of pool.  As soon as a listing arrives, its subdirectories
+    are queued too, up to max_pending listings that are queued or waiting
+    to be used.  The walk itself still asks for directories in sorted
+    depth-first order, reading any that were not fetched ahead itself, so
+    the output is exactly the same as a serial walk.
+    """
+    lock = threading.Lock()
+    pending = {}
+
+    def prefetch(entries):
+        with lock:
+            for name, fullpath, is_file in entries:
+                if len(pending) >= max_pending:
+                    break
+                if not is_file and fullpath not in pending:
+                    pending[fullpath] = pool.apply_async(
+                        getentries, (fullpath,), callback=prefetch)
+
+    def lister(path):
+        with lock:
+            result = pending.pop(path, None)
+        if result is None:
+            entries = getentries(path)
+        else:
+            entries = result.get()
+        prefetch(entries)
+        return entries
+
+    return lister
+
+
+def load_snapshot(filename):
+    """
+    Read a snapshot saved by save_snapshot, or return an empty one if the
+    file does not exist yet.  A snapshot maps each directory path to a
+    (mtime, entries) pair.
+    """
+    if not os.path.exists(filename):
+        return {}
+    f = open(filename, 'rb')
+    try:
+        return cPickle.load(f)
+    finally:
+        f.close()
+
+
+def save_snapshot(snapshot, filename):
+    tmpname = filename + '.tmp'
+    f = open(tmpname, 'wb')
+    try:
+        cPickle.dump(snapshot, f, cPickle.HIGHEST_PROTOCOL)
+    finally:
+        f.close()
+    os.rename(tmpname, filename)
+
+
+def snapshot_lister(old, new, lister=getentries):
+    """
+    Return a lister for walk that replays a directory's entries from the
+    old snapshot when its mtime has not changed, and only lists it again
+    with lister when it has.  Every directory the walk visits is recorded
+    in the new snapshot.
+    """
+    def replay(path):
+        mtime = os.stat(path).st_mtime
+        if path in old and old[path][0] == mtime:
+            entries = old[path][1]
+        else:
+            entries = lister(path)
+        new[path] = (mtime, entries)
+        return entries
+
+    return replay
+
+
+def snapshot_paths(snapshot, path):
+    """
+    Return the set of paths below path as recorded in snapshot.
+    """
+    def replay(path):
+        if path in snapshot:
+            return snapshot[path][1]
+        return []
+
+    return set(walk(path, replay))
+
+
+def summarize(path, top=10):
+    """
+    Walk the tree below path once and return a summary dictionary with the
+    total bytes and file count under path, the same totals for every
+    directory (including everything below it), and the top largest files
+    as (size, path) pairs, biggest first.
+    """
+    totals = {path: [0, 0]}
+    order = [(path, None)]
+    largest = []
+    stack = [path]
+    while stack:
+        directory = stack.pop()
+        own = totals[directory]
+        for name, fullpath, is_file, size in getsizedentries(directory):
+            if is_file:
+                own[0] += size
+                own[1] += 1
+                if len(largest) < top:
+                    heapq.heappush(largest, (size, fullpath))
+                elif top:
+                    heapq.heappushpop(largest, (size, fullpath))
+            else:
+                totals[fullpath] = [0, 0]
+                order.append((fullpath, directory))
+                stack.append(fullpath)
+    # Directories were found after their parents, so adding them up in
+    # reverse order gives every directory the totals of its whole subtree.
+    for directory, parent in reversed(order):
+        if parent is not None:
+            totals[parent][0] += totals[directory][0]
+            totals[parent][1] += totals[directory][1]
+    return {
+        'root': path,
+        'bytes': totals[path][0],
+        'files': totals[path][1],
+        'directories': dict([(directory, {'bytes': b, 'files': n})
+                             for directory, (b, n) in totals.items()]),
+        'largest': sorted(largest, reverse=True),
+    }
+
+
+def print_summary(summary):
+    print "%14s %10s  %s" % ("bytes", "files", "directory")
+    for directory in sorted(summary['directories']):
+        totals = summary['directories'][directory]
+        print "%14d %10d  %s" % (totals['bytes'], totals['files'], directory)
+    print
+    print "%14s  %s" % ("bytes", "largest files")
+    for size, path in summary['largest']:
+        print "%14d  %s" % (size, path)
+
+
+ARCHIVE_SUFFIXES = ('.tar', '.tgz', '.tar.gz', '.tbz2', '.tar.bz2')
+
+
+def is_archive(path):
+    return os.path.isfile(path) and path.endswith(ARCHIVE_SUFFIXES)
+
+
+def tar_lister(archive, root):
+    """
+    Read the member names of a .tar, .tgz or .tar.bz2 archive in a single
+    streaming pass and return a lister for walk that presents them as if
+    the archive had been extracted into root.  Only names are kept, grouped
+    by directory, and nothing is written to disk.
+    """
+    children = {root: {}}       # directory -> {name: is_file}
+    stream = tarfile.open(archive, 'r|*')
+    try:
+        for member in stream:
+            name = posixpath.normpath(member.name).lstrip('/')
+            parts = name.split('/')
+            if name == '.' or [part for part in parts if part[0] == '.']:
+                continue
+            directory = root
+            for part in parts[:-1]:
+                children[directory].setdefault(part, False)
+                directory = os.path.join(directory, part)
+                children.setdefault(directory, {})
+            is_file = not member.isdir()
+            children[directory][parts[-1]] = is_file
+            if not is_file:
+                children.setdefault(os.path.join(directory, parts[-1]), {})
+    finally:
+        stream.close()
+
+    def lister(path):
+        names = children.get(path, {})
+        return [(name, os.path.join(path, name), names[name])
+                for name in sorted(names)]
+
+    return lister
+
+
+def traverse(path, lister=getentries):
+    for fullpath in walk(path, lister):
+        print fullpath
+
+
+def main(args):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Print every path below a directory, depth first.")
+    parser.add_argument('path', nargs='?', default='')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="list up to this many directories at once")
+    parser.add_argument('--stats', action='store_true',
+                        help="report directories per second on stderr")
+    parser.add_argument('--snapshot', metavar='FILE',
+                        help="only re-list directories whose mtime changed "
+                             "since the snapshot in FILE, then update it")
+    parser.add_argument('--diff', action='store_true',
+                        help="with --snapshot, print the added (+) and "
+                             "removed (-) paths instead of the whole tree")
+    parser.add_argument('--summary', action='store_true',
+                        help="print cumulative sizes and file counts per "
+                             "directory instead of every path")
+    parser.add_argument('--top', type=int, default=10,
+                        help="number of largest files in the summary")
+    parser.add_argument('--json', action='store_true',
+                        help="print the summary as JSON")
+    options = parser.parse_args(args)
+    if options.diff and not options.snapshot:
+        parser.error("--diff needs --snapshot")
+    if options.snapshot and options.jobs > 1:
+        parser.error("--snapshot cannot be combined with --jobs")
+
+    root = getroot(options.path)
+    if is_archive(root):
+        if options.snapshot or options.summary or options.json:
+            parser.error("archives can only be listed")
+        for path in walk(root, tar_lister(root, root)):
+            print path
+        return
+    if options.summary or options.json:
+        summary = summarize(root, options.top)
+        if options.json:
+            print json.dumps(summary, indent=1, sort_keys=True)
+        else:
+            print_summary(summary)
+        return
+    pool = None
+    lister = getentries
+    if options.jobs > 1:
+        pool = ThreadPool(options.jobs)
+        lister = parallel_lister(pool, 100 * options.jobs)
+    if options.snapshot:
+        old = load_snapshot(options.snapshot)
+        new = {}
+        lister = snapshot_lister(old, new)
+
+    listed = [0]
+
+    def counting_lister(path):
+        listed[0] += 1
+        return lister(path)
+
+    started = time.time()
+    try:
+        if options.diff:
+            paths = set(walk(root, counting_lister))
+            before = snapshot_paths(old, root)
+            for path in sorted(paths - before):
+                print '+', path
+            for path in sorted(before - paths):
+                print '-', path
         else:
-            print os.path.join(path, file)
-            traverse(os.path.join(path, file))
+            traverse(root, counting_lister)
+    finally:
+        if pool is not None:
+            pool.terminate()
+    if options.snapshot:
+        save_snapshot(new, options.snapshot)
+    if options.stats:
+        elapsed = time.time() - started
+        sys.stderr.write("%d directories in %.2f s (%.0f directories/s)\n" %
+                         (listed[0], elapsed, listed[0] / max(elapsed, 1e-9)))
 
 
 if __name__ == '__main__':
-    root =  getroot()
-    traverse(root)
+    main(sys.argv[1:])
@@ -0,0 +1,164 @@
+#
+# profiling.py
+#
+# Opt-in call counting and timing for the chapter function libraries
+# (ch05.py, ch06.py, stringtools.py, wordtools.py, ...).  Typical use:
+#
+#     import profiling, ch05, ch06
+#     profiling.instrument(ch05, ch06)
+#
+# instrument() does nothing unless profiling has been turned on, either by
+# setting the THINKCS_PROFILE environment variable or by calling enable()
+# first, so when it is off the modules keep their original functions.
+#
+import atexit
+import os
+import sys
+import time
+import types
+from functools import wraps
+
+_enabled = bool(os.environ.get('THINKCS_PROFILE'))
+_originals = {}         # (module, name) -> original function
+_stats = {}             # qualified name -> [calls, seconds, histogram]
+_report_registered = []
+
+
+def enable(report=True):
+    """
+    Turn profiling on.  If report is true, print_report() runs at exit.
+    """
+    global _enabled
+    _enabled = True
+    if report and not _report_registered:
+        atexit.register(print_report)
+        _report_registered.append(True)
+
+
+def is_enabled():
+    return _enabled
+
+
+def _size(arg):
+    # A rough size for the histogram: the length of sequences, the number
+    # of bits of integers, 0 for anything else.
+    try:
+        return len(arg)
+    except TypeError:
+        pass
+    if isinstance(arg, (int, long)):
+        return abs(arg).bit_length()
+    return 0
+
+
+def _wrap(qualname, function):
+    stats = _stats.setdefault(qualname, [0, 0.0, {}])
+    histogram = stats[2]
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        size = max([_size(arg) for arg in args] or [0])
+        bucket = size.bit_length()      # sizes below 2**bucket
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+        start = time.time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats[0] += 1
+            stats[1] += time.time() - start
+    return wrapper
+
+
+def instrument(*modules):
+    """
+    Replace every function defined in each module with a wrapper that
+    records its calls, unless profiling is disabled, in which case nothing
+    happens.  Names that other modules imported earlier with "from module
+    import ..." keep pointing at the original functions.
+
+      >>> demo = types.ModuleType('demo')
+      >>> exec 'def double(s):\\n    return s + s' in demo.__dict__
+      >>> original = demo.double
+      >>> enable(report=False)
+      >>> instrument(demo)
+      >>> demo.double is original
+      False
+      >>> demo.double('a'), demo.double('abcd'), demo.double(7)
+      ('aa', 'abcdabcd', 14)
+      >>> [row[:2] for row in report()]
+      [('demo.double', 3)]
+      >>> report()[0][3]
+      {1: 1, 2: 1, 3: 1}
+      >>> uninstrument()
+      >>> demo.double is original
+      True
+    """
+    if not _enabled:
+        return
+    for module in modules:
+        for name, value in vars(module).items():
+            if (isinstance(value, types.FunctionType) and
+                    value.__module__ == module.__name__ and
+                    (module, name) not in _originals):
+                _originals[(module, name)] = value
+                qualname = '%s.%s' % (module.__name__, name)
+                setattr(module, name, _wrap(qualname, value))
+
+
+def uninstrument():
+    """
+    Put back every function replaced by instrument().
+    """
+    for (module, name), function in _originals.items():
+        setattr(module, name, function)
+    _originals.clear()
+
+
+def report():
+    """
+    Return a list of (name, calls, seconds, histogram) tuples, most
+    expensive first.  histogram maps b to the number of calls whose largest
+    argument had a size below 2**b.
+    """
+    rows = [(name, calls, seconds, dict(histogram))
+            for name, (calls, seconds, histogram) in _stats.items() if calls]
+    rows.sort(key=lambda row: (-row[2], row[0]))
+    return rows
+
+
+def print_report(outfile=None):
+    """
+    Print the report, sorted by cumulative time.
+    """
+    if outfile is None:
+        outfile = sys.stderr
+    rows = report()
+    if not rows:
+        return
+    outfile.write("%-36s %10s %12s  %s\n" %
+                  ("function", "calls", "seconds", "arg sizes (< 2**b: n)"))
+    for name, calls, seconds, histogram in rows:
+        sizes = ' '.join(["%d:%d" % (b, histogram[b])
+                          for b in sorted(histogram)])
+        outfile.write("%-36s %10d %12.6f  %s\n" %
+                      (name, calls, seconds, sizes))
+
+
+def reset():
+    """
+    Forget all the statistics collected so far.
+    """
+    for stats in _stats.values():
+        stats[0] = 0
+        stats[1] = 0.0
+        stats[2].clear()
+
+
+if _enabled:
+    atexit.register(print_report)
+    _report_registered.append(True)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()